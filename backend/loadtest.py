@@ -0,0 +1,347 @@
+"""
+Load-testing harness for the Sorting Algorithms API.
+
+Starts the app locally with uvicorn (or targets a running server with --url),
+drives it with a mix of algorithms, array sizes and concurrency levels, and
+writes a JSON report with throughput, latency percentiles, error rate and
+server RSS over time. Only the standard library is used, so reports from
+different versions can be produced and diffed in the same environment.
+
+Inputs are cold by default: every request sends a freshly generated array, so
+server-side caches miss. Use --inputs warm to draw from a fixed pool of arrays
+per combination instead. All inputs and the request mix follow --seed, so two
+runs with the same seed send the same requests. The server started by the
+harness runs without the on-disk result store (SORT_STORE_PATH is removed from
+its environment) so that earlier runs cannot turn a cold run into store hits.
+
+Example:
+    python loadtest.py --sizes 10,50 --concurrency 1,8,32 --duration 10 --output report.json
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+ALGORITHMS = ["bubble", "selection", "insertion", "merge", "quick", "heap", "radix", "bucket"]
+
+
+def parse_list(value: str, cast=str) -> List[Any]:
+    return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """
+    Start the app with uvicorn in a subprocess, without the result store,
+    and wait until it answers
+    """
+    env = {name: value for name, value in os.environ.items() if name != "SORT_STORE_PATH"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+        try:
+            connection.request("GET", "/")
+            if connection.getresponse().status == 200:
+                return process
+        except (OSError, http.client.HTTPException):
+            pass
+        finally:
+            connection.close()
+        time.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError("Server did not start within 30 seconds")
+
+
+def read_rss(pid: Optional[int]) -> Optional[int]:
+    """
+    Return the resident set size of a process in bytes, or None if unavailable
+    """
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return None
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return None
+    index = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(latency * 1000 for latency in latencies)
+
+    def rounded(value):
+        return round(value, 3) if value is not None else None
+
+    return {
+        "p50": rounded(percentile(values, 0.50)),
+        "p95": rounded(percentile(values, 0.95)),
+        "p99": rounded(percentile(values, 0.99)),
+        "mean": rounded(sum(values) / len(values)) if values else None,
+        "max": rounded(values[-1]) if values else None,
+    }
+
+
+def random_array(rng: random.Random, size: int, max_value: int) -> List[int]:
+    return [rng.randint(1, max_value) for _ in range(size)]
+
+
+def build_workload(algorithms: List[str], sizes: List[int], endpoints: List[str],
+                   max_value: int, pool_size: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Build one entry per (endpoint, algorithm, size) combination, each with a
+    deterministic pool of arrays used by warm inputs
+    """
+    rng = random.Random(seed)
+    workload = []
+    for endpoint in endpoints:
+        method, path = endpoint.split(" ", 1)
+        for algorithm in algorithms:
+            for size in sizes:
+                workload.append({
+                    "endpoint": endpoint,
+                    "algorithm": algorithm,
+                    "size": size,
+                    "method": method,
+                    "path": path,
+                    "pool": [random_array(rng, size, max_value) for _ in range(pool_size)],
+                })
+    return workload
+
+
+def build_request(item: Dict[str, Any], array: List[int]):
+    """
+    Return the target and body of a request for one workload entry
+    """
+    if item["method"] == "GET":
+        query = urllib.parse.urlencode({"algorithm": item["algorithm"],
+                                        "array": ",".join(map(str, array))})
+        return f'{item["path"]}?{query}', None
+    return item["path"], json.dumps({"algorithm": item["algorithm"], "array": array})
+
+
+def run_level(host: str, port: int, workload: List[Dict[str, Any]], concurrency: int,
+              duration: float, requests_per_level: Optional[int], inputs: str, max_value: int,
+              pid: Optional[int], rss_interval: float, seed: int, level: int = 0) -> Dict[str, Any]:
+    """
+    Drive the server at one concurrency level and summarize the results.
+    Cold arrays are derived from the seed, the level, the worker and its
+    request counter, so they are reproducible but never repeat within a run.
+    """
+    results = []
+    results_lock = threading.Lock()
+    issued = [0]
+    stop = threading.Event()
+    start = time.monotonic()
+
+    def next_request(rng):
+        if requests_per_level is not None:
+            with results_lock:
+                if issued[0] >= requests_per_level:
+                    return None
+                issued[0] += 1
+        elif time.monotonic() - start >= duration:
+            return None
+        return rng.choice(workload)
+
+    def worker(worker_id):
+        rng = random.Random(f"{seed}:{level}:{worker_id}")
+        connection = http.client.HTTPConnection(host, port, timeout=120)
+        counter = 0
+        while True:
+            item = next_request(rng)
+            if item is None:
+                break
+            if inputs == "warm":
+                array = rng.choice(item["pool"])
+            else:
+                cold_rng = random.Random(f"{seed}:{level}:{worker_id}:{counter}")
+                array = random_array(cold_rng, item["size"], max_value)
+            counter += 1
+            target, body = build_request(item, array)
+            headers = {"Content-Type": "application/json"} if body else {}
+            sent = time.perf_counter()
+            try:
+                connection.request(item["method"], target, body=body, headers=headers)
+                response = connection.getresponse()
+                payload = response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(host, port, timeout=120)
+                payload = b""
+                status = None
+            elapsed = time.perf_counter() - sent
+            with results_lock:
+                results.append((item, status, elapsed, len(payload)))
+        connection.close()
+
+    rss_samples = []
+
+    def sample_rss():
+        while not stop.is_set():
+            rss = read_rss(pid)
+            if rss is not None:
+                rss_samples.append({"t": round(time.monotonic() - start, 3), "rss_bytes": rss})
+            stop.wait(rss_interval)
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    elapsed = time.monotonic() - start
+    stop.set()
+    sampler.join()
+
+    def summarize(entries):
+        errors = sum(1 for _, status, _, _ in entries if status is None or status >= 400)
+        return {
+            "requests": len(entries),
+            "errors": errors,
+            "error_rate": round(errors / len(entries), 4) if entries else 0.0,
+            "latency_ms": latency_summary([latency for _, _, latency, _ in entries]),
+        }
+
+    status_codes = {}
+    for _, status, _, _ in results:
+        key = str(status) if status is not None else "connection_error"
+        status_codes[key] = status_codes.get(key, 0) + 1
+
+    groups = {}
+    for entry in results:
+        item = entry[0]
+        groups.setdefault(f'{item["endpoint"]} {item["algorithm"]} n={item["size"]}', []).append(entry)
+
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 3) if elapsed else 0.0,
+        "bytes_received": sum(size for _, _, _, size in results),
+        "status_codes": status_codes,
+        **summarize(results),
+        "by_request": {name: summarize(entries) for name, entries in sorted(groups.items())},
+        "rss": {
+            "peak_bytes": max((sample["rss_bytes"] for sample in rss_samples), default=None),
+            "samples": rss_samples,
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Load test the Sorting Algorithms API")
+    parser.add_argument("--url", help="Target a running server instead of starting one, e.g. http://localhost:8000")
+    parser.add_argument("--pid", type=int, help="PID of the server given with --url, for RSS sampling")
+    parser.add_argument("--endpoints", default="POST /sort",
+                        help='Comma-separated "METHOD /path" entries (default: "POST /sort")')
+    parser.add_argument("--algorithms", default=",".join(ALGORITHMS), help="Comma-separated algorithms")
+    parser.add_argument("--sizes", default="10,50", help="Comma-separated array sizes")
+    parser.add_argument("--max-value", type=int, default=100, help="Largest value in generated arrays")
+    parser.add_argument("--inputs", choices=["cold", "warm"], default="cold",
+                        help="cold sends a new array with every request, warm reuses a pool per combination")
+    parser.add_argument("--pool-size", type=int, default=20, help="Arrays per combination for warm inputs")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--requests", type=int, help="Requests per concurrency level instead of --duration")
+    parser.add_argument("--rss-interval", type=float, default=0.5, help="Seconds between RSS samples")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated arrays and request mix")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    endpoints = parse_list(args.endpoints)
+    workload = build_workload(parse_list(args.algorithms), parse_list(args.sizes, int), endpoints,
+                              args.max_value, args.pool_size, args.seed)
+
+    process = None
+    if args.url:
+        parsed = urllib.parse.urlparse(args.url)
+        host, port, pid = parsed.hostname, parsed.port or 80, args.pid
+    else:
+        host, port = "127.0.0.1", free_port()
+        process = start_server(port)
+        pid = process.pid
+
+    try:
+        levels = [
+            run_level(host, port, workload, concurrency, args.duration, args.requests, args.inputs,
+                      args.max_value, pid, args.rss_interval, args.seed, level)
+            for level, concurrency in enumerate(parse_list(args.concurrency, int))
+        ]
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report = {
+        "config": {
+            "endpoints": endpoints,
+            "algorithms": parse_list(args.algorithms),
+            "sizes": parse_list(args.sizes, int),
+            "max_value": args.max_value,
+            "inputs": args.inputs,
+            "pool_size": args.pool_size if args.inputs == "warm" else None,
+            "concurrency": parse_list(args.concurrency, int),
+            "duration_s": args.duration if args.requests is None else None,
+            "requests_per_level": args.requests,
+            "seed": args.seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "levels": levels,
+    }
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(output + "\n")
+    else:
+        print(output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
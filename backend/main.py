@@ -1,11 +1,27 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional, Literal
 import uvicorn
+import hashlib
+import json
 import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
 
-app = FastAPI(title="Sorting Algorithms API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fill the result store with the presets in the background so startup is not blocked
+    if RESULT_STORE is not None and SORT_STORE_WARMUP:
+        threading.Thread(target=warm_result_store, daemon=True).start()
+    yield
+
+app = FastAPI(title="Sorting Algorithms API", lifespan=lifespan)
 
 # Add CORS middleware to allow frontend to communicate with this API
 app.add_middleware(
@@ -14,11 +30,141 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Longest array accepted by the analysis endpoints, configurable through the environment
+MAX_ARRAY_LENGTH = int(os.environ.get("MAX_ARRAY_LENGTH", 10_000))
+
+# Limits applied to /sort before any work is done, configurable through the environment
+MAX_SORT_FRAMES = int(os.environ.get("SORT_MAX_FRAMES", 100_000))
+MAX_SORT_RESPONSE_BYTES = int(os.environ.get("SORT_MAX_RESPONSE_BYTES", 32 * 1024 * 1024))
+
+# /sort results are a pure function of the request, so they can be cached.
+# Bump the version whenever an algorithm changes the history it records.
+SORT_RESULT_VERSION = 1
+SORT_CACHE_MAX_AGE = int(os.environ.get("SORT_CACHE_MAX_AGE", 86400))
+
+# Optional on-disk store of encoded /sort results, enabled by setting SORT_STORE_PATH
+SORT_STORE_PATH = os.environ.get("SORT_STORE_PATH")
+SORT_STORE_MAX_BYTES = int(os.environ.get("SORT_STORE_MAX_BYTES", 256 * 1024 * 1024))
+SORT_STORE_WARMUP = os.environ.get("SORT_STORE_WARMUP", "1") != "0"
+
+# Integers in GET /sort URLs must be written canonically, so every array has exactly one URL
+CANONICAL_INTEGER = re.compile(r"0|-?[1-9][0-9]*")
+
+AlgorithmName = Literal["bubble", "selection", "insertion", "merge", "quick", "heap", "radix", "bucket"]
+
 class SortRequest(BaseModel):
     array: List[int]
-    algorithm: Literal["bubble", "selection", "insertion", "merge", "quick", "heap", "radix", "bucket"]
+    algorithm: AlgorithmName
+    # "stats" returns only the sorted array and the stats, without the history
+    output: Literal["full", "stats"] = "full"
+
+class AnalyzeRequest(BaseModel):
+    array: List[int]
+
+class ResultStore:
+    """
+    SQLite-backed store of compressed /sort response bodies keyed by request hash.
+    The least recently accessed results are evicted once the store exceeds max_bytes.
+    Access times are collected in memory and written in batches, so cache hits
+    do not each pay for a write; the total size is tracked in memory as well.
+    """
+
+    # Pending access times are written once this many have accumulated or this
+    # many seconds have passed, and always before evicting
+    ACCESS_FLUSH_BATCH = 256
+    ACCESS_FLUSH_SECONDS = 5.0
+
+    def __init__(self, path: str, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # Losing the last few writes on power failure only costs recomputing them
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+        self.connection.commit()
+        self.total_bytes = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        self.pending_accesses = {}
+        self.last_flush = time.monotonic()
+
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            row = self.connection.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def flush_accesses(self):
+        """
+        Write the pending access times. Must be called with the lock held.
+        """
+        if self.pending_accesses:
+            self.connection.executemany(
+                "UPDATE results SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self.pending_accesses.items()],
+            )
+            self.connection.commit()
+            self.pending_accesses = {}
+        self.last_flush = time.monotonic()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            row = self.connection.execute("SELECT body FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.pending_accesses[key] = time.time()
+            if (len(self.pending_accesses) >= self.ACCESS_FLUSH_BATCH
+                    or time.monotonic() - self.last_flush >= self.ACCESS_FLUSH_SECONDS):
+                self.flush_accesses()
+        return zlib.decompress(row[0])
+
+    def put(self, key: str, body: bytes, protected: frozenset = frozenset()) -> bool:
+        """
+        Store a body, evicting old results as needed. Nothing is stored and
+        False is returned if that would mean evicting one of the protected keys.
+        """
+        compressed = zlib.compress(body)
+        if len(compressed) > self.max_bytes:
+            return False
+
+        with self.lock:
+            # Eviction must see the latest access times
+            self.flush_accesses()
+
+            row = self.connection.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            total = self.total_bytes - (row[0] if row else 0) + len(compressed)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (key, body, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, compressed, len(compressed), time.time()),
+            )
+
+            # Evict the least recently accessed results until the store fits
+            if total > self.max_bytes:
+                evicted = []
+                for old_key, size in self.connection.execute(
+                        "SELECT key, size FROM results WHERE key != ? ORDER BY last_access", (key,)):
+                    if total <= self.max_bytes:
+                        break
+                    if old_key in protected:
+                        self.connection.rollback()
+                        return False
+                    evicted.append((old_key,))
+                    total -= size
+                self.connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+            self.connection.commit()
+            self.total_bytes = total
+        return True
+
+RESULT_STORE = ResultStore(SORT_STORE_PATH, SORT_STORE_MAX_BYTES) if SORT_STORE_PATH else None
 
 
 # Sorting algorithm implementations with history tracking
@@ -725,15 +871,412 @@ SORT_ALGORITHMS = {
     "bucket": bucket_sort,
 }
 
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to the Sorting Algorithm API"}
+# Presortedness analysis and cost prediction
+def count_inversions(input_array: List[int]):
+    """
+    Count inversions with a merge pass in O(n log n).
+    Returns the total, the number of larger elements preceding each position,
+    and the stable sorted order of the original indices.
+    """
+    n = len(input_array)
+    left_greater = [0] * n
 
-@app.post("/sort")
-def sort_array(request: SortRequest):
-    if request.algorithm not in SORT_ALGORITHMS:
-        raise HTTPException(status_code=400, detail=f"Algorithm {request.algorithm} not supported")
-    
+    def merge_count(indices):
+        if len(indices) <= 1:
+            return indices, 0
+
+        mid = len(indices) // 2
+        left, left_inversions = merge_count(indices[:mid])
+        right, right_inversions = merge_count(indices[mid:])
+
+        merged = []
+        inversions = left_inversions + right_inversions
+        i = j = 0
+        while i < len(left) and j < len(right):
+            if input_array[left[i]] <= input_array[right[j]]:
+                merged.append(left[i])
+                i += 1
+            else:
+                # Every remaining element of the left half is larger
+                remaining = len(left) - i
+                inversions += remaining
+                left_greater[right[j]] += remaining
+                merged.append(right[j])
+                j += 1
+        merged.extend(left[i:])
+        merged.extend(right[j:])
+        return merged, inversions
+
+    order, inversions = merge_count(list(range(n)))
+    return inversions, left_greater, order
+
+def find_runs(input_array: List[int]) -> Dict[str, List[int]]:
+    """
+    Return the lengths of the maximal ascending (non-decreasing) and
+    descending (strictly decreasing) runs
+    """
+    runs = {"ascending": [], "descending": []}
+    n = len(input_array)
+    start = 0
+
+    while start < n:
+        end = start + 1
+        if end < n and input_array[end] < input_array[start]:
+            while end < n and input_array[end] < input_array[end - 1]:
+                end += 1
+            runs["descending"].append(end - start)
+        else:
+            while end < n and input_array[end] >= input_array[end - 1]:
+                end += 1
+            runs["ascending"].append(end - start)
+        start = end
+
+    return runs
+
+def predict_costs(input_array: List[int], algorithms: Optional[List[str]] = None,
+                  inversion_counts=None, runs: Optional[Dict[str, List[int]]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Predict comparisons, moves and history frames for the given algorithms,
+    all of SORT_ALGORITHMS by default. Bubble and insertion sort are exact; the
+    others are estimates. Frames are upper bounds, except for quick sort, which
+    is counted exactly by count_quick_sort_frames when a request is checked
+    against the limits. The inversion counts and runs are computed only when
+    one of the algorithms needs them, unless they are passed in.
+    """
+    algorithms = list(SORT_ALGORITHMS) if algorithms is None else algorithms
+    n = len(input_array)
+    log_n = math.ceil(math.log2(n)) if n > 1 else 0
+    predictions = {}
+
+    if inversion_counts is None and {"bubble", "selection", "insertion", "quick"} & set(algorithms):
+        inversion_counts = count_inversions(input_array)
+    if inversion_counts is not None:
+        inversions, left_greater, order = inversion_counts
+    if runs is None and "quick" in algorithms:
+        runs = find_runs(input_array)
+
+    if "bubble" in algorithms:
+        # Bubble sort: an element with k larger predecessors needs k passes,
+        # plus one pass without swaps to stop early
+        passes = min(n, max(left_greater, default=0) + 1)
+        predictions["bubble"] = {
+            "comparisons": sum(n - 1 - i for i in range(passes)),
+            "moves": inversions,
+        }
+        predictions["bubble"]["frames"] = 2 + passes + predictions["bubble"]["comparisons"] + inversions
+
+    if "selection" in algorithms:
+        # Selection sort: always n(n-1)/2 comparisons, one swap per misplaced cycle
+        visited = [False] * n
+        cycles = 0
+        for position in range(n):
+            if not visited[position]:
+                cycles += 1
+                current = position
+                while not visited[current]:
+                    visited[current] = True
+                    current = order[current]
+        predictions["selection"] = {
+            "comparisons": n * (n - 1) // 2,
+            "moves": n - cycles,
+            # Every new minimum found during a scan is recorded as well, and each
+            # of those is an inversion; duplicates can add swaps beyond n - cycles
+            "frames": 2 + 2 * n + n * (n - 1) // 2 + min(inversions, n * (n - 1) // 2) + max(n - 1, 0),
+        }
+
+    if "insertion" in algorithms:
+        # Insertion sort: one shift per inversion, plus the comparison that stops
+        # the scan whenever the key does not travel all the way to the front
+        predictions["insertion"] = {
+            "comparisons": inversions + sum(1 for i in range(1, n) if left_greater[i] < i),
+            "moves": inversions,
+            "frames": 2 + 3 * max(n - 1, 0) + 2 * inversions,
+        }
+
+    if "merge" in algorithms:
+        # Merge sort: worst-case bound, every element is copied once per level
+        predictions["merge"] = {
+            "comparisons": max(n * log_n - 2 ** log_n + 1, 0),
+            "moves": n * log_n,
+            "frames": 2 + 3 * max(n - 1, 0) + max(n * log_n - 2 ** log_n + 1, 0) + n * log_n,
+        }
+
+    if "quick" in algorithms:
+        # Quick sort with the last element as pivot degrades to n^2/2 on every
+        # monotone run and on every group of equal values
+        run_cost = sum(length * (length - 1) // 2
+                       for length in runs["ascending"] + runs["descending"])
+        counts = {}
+        for value in input_array:
+            counts[value] = counts.get(value, 0) + 1
+        duplicate_cost = sum(count * (count - 1) // 2 for count in counts.values())
+        run_count = len(runs["ascending"]) + len(runs["descending"])
+        random_cost = int(1.39 * n * math.log2(max(run_count, 2))) if n > 1 else 0
+        quick_comparisons = max(run_cost, duplicate_cost) + random_cost
+        predictions["quick"] = {
+            "comparisons": min(quick_comparisons, n * (n - 1) // 2),
+            "moves": min(quick_comparisons // 2, inversions + n),
+        }
+        predictions["quick"]["frames"] = (2 + 2 * n + predictions["quick"]["comparisons"]
+                                          + predictions["quick"]["moves"])
+
+    if "heap" in algorithms:
+        # Heap sort is insensitive to the input order
+        predictions["heap"] = {
+            "comparisons": 2 * n * log_n,
+            "moves": n * log_n,
+            # Up to four frames per heapify call: at most n // 2 + n calls while
+            # building the heap, and one per level of the heap on every extraction
+            "frames": 2 + 2 * max(n - 1, 0) + 4 * (n // 2 + n + sum(i.bit_length() for i in range(1, n))),
+        }
+
+    if "radix" in algorithms:
+        # Radix sort: three passes over the array per decimal digit, and the
+        # implementation does not handle negative values or empty arrays
+        max_val = max(input_array, default=0)
+        digits = len(str(max_val)) if max_val > 0 else 0
+        predictions["radix"] = {
+            "comparisons": 0,
+            "moves": 3 * n * digits,
+            "frames": 2 + digits * (3 * n + 1),
+            "supported": n > 0 and min(input_array) >= 0,
+        }
+
+    if "bucket" in algorithms:
+        # Bucket sort: distribute into the same buckets as bucket_sort, then
+        # insertion sort each bucket. The implementation does not handle empty arrays.
+        bucket_comparisons = 0
+        bucket_moves = 2 * n
+        if n > 0:
+            min_val = min(input_array)
+            max_val = max(input_array)
+            bucket_count = min(n, 10)
+            bucket_range = (max_val - min_val) / bucket_count + 1
+            buckets = [[] for _ in range(bucket_count)]
+            for value in input_array:
+                buckets[min(int((value - min_val) / bucket_range), bucket_count - 1)].append(value)
+            for bucket in buckets:
+                bucket_inversions = count_inversions(bucket)[0]
+                bucket_comparisons += bucket_inversions + max(len(bucket) - 1, 0)
+                bucket_moves += bucket_inversions
+        predictions["bucket"] = {
+            "comparisons": bucket_comparisons,
+            "moves": bucket_moves,
+            "frames": 2 + 3 * n + min(n, 10),
+            "supported": n > 0,
+        }
+
+    for prediction in predictions.values():
+        prediction.setdefault("supported", True)
+        prediction["operations"] = prediction["comparisons"] + prediction["moves"]
+
+    return predictions
+
+def count_quick_sort_frames(input_array: List[int], limit: int) -> int:
+    """
+    Count the frames quick_sort records without building them, stopping as
+    soon as the count exceeds limit
+    """
+    array = input_array.copy()
+    n = len(array)
+    frames = 1
+    stack = [(0, n - 1)]
+
+    while stack and frames <= limit:
+        low, high = stack.pop()
+        if low >= high:
+            continue
+
+        # Pivot selection, one frame per comparison and the sorted pivot
+        frames += 2 + high - low
+        pivot = array[high]
+        i = low - 1
+        for j in range(low, high):
+            if array[j] <= pivot:
+                i += 1
+                if i != j:
+                    array[i], array[j] = array[j], array[i]
+                    frames += 1
+        if i + 1 != high:
+            array[i + 1], array[high] = array[high], array[i + 1]
+            frames += 1
+
+        stack.append((i + 2, high))
+        stack.append((low, i))
+
+    # The whole range is marked sorted once, either after the top-level
+    # partition or as the final step
+    if n > 0:
+        frames += 1
+    return frames
+
+def check_array_length(input_array: List[int]):
+    """
+    Reject arrays too long to analyze cheaply
+    """
+    if len(input_array) > MAX_ARRAY_LENGTH:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Array of length {len(input_array)} exceeds the limit of {MAX_ARRAY_LENGTH}",
+        )
+
+def analyze_array(input_array: List[int]) -> Dict[str, Any]:
+    """
+    Measure how presorted an array is and recommend the cheapest algorithm
+    """
+    n = len(input_array)
+    inversions, left_greater, order = count_inversions(input_array)
+    runs = find_runs(input_array)
+
+    # Distance between each element's position and its stable sorted position
+    max_displacement = max((abs(index - position) for position, index in enumerate(order)), default=0)
+
+    max_inversions = n * (n - 1) // 2
+    metrics = {
+        "length": n,
+        "inversions": inversions,
+        "sortedness": 1 - inversions / max_inversions if max_inversions else 1.0,
+        "ascending_runs": len(runs["ascending"]),
+        "descending_runs": len(runs["descending"]),
+        "longest_ascending_run": max(runs["ascending"], default=0),
+        "longest_descending_run": max(runs["descending"], default=0),
+        "duplicate_ratio": 1 - len(set(input_array)) / n if n else 0.0,
+        "min_value": min(input_array, default=None),
+        "max_value": max(input_array, default=None),
+        "value_range": max(input_array) - min(input_array) if n else 0,
+        "max_displacement": max_displacement,
+    }
+
+    predictions = predict_costs(input_array, inversion_counts=(inversions, left_greater, order), runs=runs)
+    recommended = min(
+        (name for name in SORT_ALGORITHMS if predictions[name]["supported"]),
+        key=lambda name: predictions[name]["operations"],
+    )
+
+    return {
+        "metrics": metrics,
+        "predictions": predictions,
+        "recommended": recommended,
+    }
+
+def estimate_sort(request: SortRequest) -> Dict[str, Any]:
+    """
+    Predict the number of frames and the response size of a /sort request
+    and check them against the configured limits
+    """
+    array = request.array
+    n = len(array)
+    limits = {
+        "frames": MAX_SORT_FRAMES,
+        "response_bytes": MAX_SORT_RESPONSE_BYTES,
+    }
+
+    # Reject on n alone before any O(n log n) work. Every algorithm records at
+    # least n frames (except radix sort without digits, which records one), and
+    # a full frame carries the whole array, at least 2n - 1 bytes.
+    # The stats output still sends the array once.
+    min_frames = n if request.algorithm != "radix" or max(array, default=0) > 0 else 1
+    min_bytes = min_frames * (2 * n - 1) if request.output == "full" else 2 * n - 1
+    early_reasons = []
+    if n == 0:
+        early_reasons.append("array must not be empty")
+    if min_frames > MAX_SORT_FRAMES:
+        early_reasons.append(f"at least {min_frames} frames exceeds the limit of {MAX_SORT_FRAMES}")
+    if min_bytes > MAX_SORT_RESPONSE_BYTES:
+        early_reasons.append(f"at least {min_bytes} bytes exceeds the limit of {MAX_SORT_RESPONSE_BYTES}")
+    if early_reasons:
+        return {
+            "algorithm": request.algorithm,
+            "output": request.output,
+            "frames": min_frames,
+            "response_bytes": min_bytes,
+            "operations": None,
+            "supported": n > 0,
+            "limits": limits,
+            "accepted": False,
+            "reasons": early_reasons,
+            # Only worth retrying with the stats output if the history alone was too large
+            "retry": {"output": "stats"} if (
+                request.output == "full" and n > 0 and min_frames <= MAX_SORT_FRAMES
+                and 2 * n - 1 <= MAX_SORT_RESPONSE_BYTES
+            ) else None,
+        }
+
+    prediction = predict_costs(array, [request.algorithm])[request.algorithm]
+    frames = prediction["frames"]
+    if request.algorithm == "quick":
+        # The quick sort prediction is a heuristic, so count its frames instead;
+        # the work is bounded because counting stops past the limit
+        frames = count_quick_sort_frames(array, MAX_SORT_FRAMES)
+
+    # Each frame carries the whole array plus its index lists: sortedIndices
+    # and selectedIndices can each hold all n indices (merge sort selects the
+    # whole range while everything is already marked sorted), comparingIndices
+    # two and pivotIndices one. Keys and punctuation take 93 bytes per frame.
+    array_bytes = sum(len(str(value)) for value in array) + n
+    index_bytes = (2 * n + 3) * (len(str(max(n - 1, 0))) + 1)
+    frame_bytes = 93 + array_bytes + index_bytes
+    stats_bytes = 100 + array_bytes
+
+    # The history is wrapped with the stats, whose counts never exceed the frame count
+    full_bytes = 48 + 2 * len(str(frames)) + frames * frame_bytes
+    response_bytes = full_bytes if request.output == "full" else stats_bytes
+
+    reasons = []
+    if not prediction["supported"]:
+        reasons.append(f"{request.algorithm} sort does not support this array")
+    if frames > MAX_SORT_FRAMES:
+        reasons.append(f"{frames} frames exceeds the limit of {MAX_SORT_FRAMES}")
+    if response_bytes > MAX_SORT_RESPONSE_BYTES:
+        reasons.append(f"{response_bytes} bytes exceeds the limit of {MAX_SORT_RESPONSE_BYTES}")
+
+    # Only the history is expensive to send, so the stats output is worth
+    # retrying when the frame count itself is within the limit
+    retry = None
+    if (reasons and prediction["supported"] and request.output == "full"
+            and frames <= MAX_SORT_FRAMES and stats_bytes <= MAX_SORT_RESPONSE_BYTES):
+        retry = {"output": "stats", "response_bytes": stats_bytes}
+
+    return {
+        "algorithm": request.algorithm,
+        "output": request.output,
+        "frames": frames,
+        "response_bytes": response_bytes,
+        "operations": prediction["operations"],
+        "supported": prediction["supported"],
+        "limits": limits,
+        "accepted": not reasons,
+        "reasons": reasons,
+        "retry": retry,
+    }
+
+def sort_request_hash(request: SortRequest) -> str:
+    """
+    Hash everything that determines a /sort result, without running the sort
+    """
+    key = json.dumps({
+        "version": SORT_RESULT_VERSION,
+        "algorithm": request.algorithm,
+        "array": request.array,
+        "output": request.output,
+    }, separators=(",", ":"))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag, using weak comparison
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+def run_sort(request: SortRequest) -> Dict[str, Any]:
+    """
+    Run the requested algorithm and build the /sort response body
+    """
     # Call the appropriate sorting function
     sort_func = SORT_ALGORITHMS[request.algorithm]
     history = sort_func(request.array)
@@ -741,6 +1284,15 @@ def sort_array(request: SortRequest):
     # Count operations
     comparisons = sum(1 for step in history if step["comparingIndices"])
     swaps = sum(1 for step in history if len(step["selectedIndices"]) >= 2)
+
+    if request.output == "stats":
+        return {
+            "array": history[-1]["array"],
+            "stats": {
+                "comparisons": comparisons,
+                "swaps": swaps
+            }
+        }
     
     return {
         "history": history,
@@ -750,5 +1302,125 @@ def sort_array(request: SortRequest):
         }
     }
 
+def encode_result(result: Dict[str, Any]) -> bytes:
+    """
+    Encode a response body the same way FastAPI's JSONResponse does
+    """
+    return json.dumps(result, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+def preset_requests() -> List[SortRequest]:
+    """
+    Requests for the deterministic arrays the frontend generates: reversed
+    arrays for every size on the slider, and sorted arrays for the sizes
+    where "nearly sorted" performs no swaps
+    """
+    requests = []
+    for size in range(5, 51, 5):
+        arrays = [list(range(size, 0, -1))]
+        if size * 0.1 < 1:
+            arrays.append(list(range(1, size + 1)))
+        for array in arrays:
+            for algorithm in SORT_ALGORITHMS:
+                requests.append(SortRequest(array=array, algorithm=algorithm))
+    return requests
+
+def warm_result_store():
+    """
+    Precompute the preset results that are not in the store yet, stopping
+    once the store is too small to hold another one without evicting a preset
+    """
+    requests = preset_requests()
+    preset_keys = frozenset(sort_request_hash(request) for request in requests)
+    for request in requests:
+        key = sort_request_hash(request)
+        if key not in RESULT_STORE and estimate_sort(request)["accepted"]:
+            if not RESULT_STORE.put(key, encode_result(run_sort(request)), protected=preset_keys):
+                break
+
+def sort_response(request: SortRequest, if_none_match: Optional[str], response: Response, cacheable: bool):
+    """
+    Validate a /sort request and answer it. A GET whose ETag the client already
+    has gets 304; the same precondition on a POST fails with 412.
+    Only GET responses are marked cacheable.
+    """
+    if request.algorithm not in SORT_ALGORITHMS:
+        raise HTTPException(status_code=400, detail=f"Algorithm {request.algorithm} not supported")
+
+    check_array_length(request.array)
+
+    # ETags are only ever issued for accepted requests, so a match needs no further checks
+    key = sort_request_hash(request)
+    headers = {"ETag": f'"{key}"'}
+    if cacheable:
+        headers["Cache-Control"] = f"public, max-age={SORT_CACHE_MAX_AGE}"
+    if etag_matches(if_none_match, headers["ETag"]):
+        if not cacheable:
+            raise HTTPException(status_code=412, detail="Precondition Failed", headers=headers)
+        return Response(status_code=304, headers=headers)
+
+    # Results in the store were accepted when they were computed
+    if RESULT_STORE is not None:
+        body = RESULT_STORE.get(key)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers=headers)
+
+    # Reject unsupported and oversized requests before running the sort
+    sort_estimate = estimate_sort(request)
+    if not sort_estimate["supported"]:
+        raise HTTPException(status_code=400, detail={
+            "message": "Unsupported input: " + "; ".join(sort_estimate["reasons"]),
+            "estimate": sort_estimate,
+        })
+    if not sort_estimate["accepted"]:
+        raise HTTPException(status_code=413, detail={
+            "message": "Request too large: " + "; ".join(sort_estimate["reasons"]),
+            "estimate": sort_estimate,
+        })
+
+    if RESULT_STORE is not None:
+        body = encode_result(run_sort(request))
+        RESULT_STORE.put(key, body)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    response.headers.update(headers)
+    return run_sort(request)
+
+@app.get("/")
+def read_root():
+    return {"message": "Welcome to the Sorting Algorithm API"}
+
+@app.post("/analyze")
+def analyze(request: AnalyzeRequest):
+    check_array_length(request.array)
+    return analyze_array(request.array)
+
+@app.post("/sort/estimate")
+def estimate(request: SortRequest):
+    check_array_length(request.array)
+    return estimate_sort(request)
+
+@app.post("/sort")
+def sort_array(request: SortRequest, response: Response, if_none_match: Optional[str] = Header(None)):
+    return sort_response(request, if_none_match, response, cacheable=False)
+
+@app.get("/sort")
+def sort_array_get(
+    response: Response,
+    algorithm: AlgorithmName,
+    array: str = Query(..., description="Comma-separated integers"),
+    output: Literal["full", "stats"] = "full",
+    if_none_match: Optional[str] = Header(None),
+):
+    # The input is encoded in the URL so that reverse proxies can cache the result.
+    # Items must be canonical integers, so every array is named by exactly one URL.
+    items = array.split(",") if array else []
+    if not all(CANONICAL_INTEGER.fullmatch(item) for item in items):
+        raise HTTPException(status_code=400, detail="array must be a comma-separated list of integers "
+                                                    "without signs, spaces or leading zeros")
+
+    request = SortRequest(array=[int(item) for item in items], algorithm=algorithm, output=output)
+    return sort_response(request, if_none_match, response, cacheable=True)
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
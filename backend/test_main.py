@@ -0,0 +1,306 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import loadtest
+import main
+
+client = TestClient(main.app)
+
+
+def counted_bubble_sort(array):
+    """
+    Bubble sort as implemented in main.bubble_sort, counting comparisons and swaps
+    """
+    array = array.copy()
+    n = len(array)
+    comparisons = swaps = 0
+    for i in range(n):
+        swapped = False
+        for j in range(0, n - i - 1):
+            comparisons += 1
+            if array[j] > array[j + 1]:
+                array[j], array[j + 1] = array[j + 1], array[j]
+                swaps += 1
+                swapped = True
+        if not swapped:
+            break
+    return comparisons, swaps
+
+
+def counted_insertion_sort(array):
+    """
+    Insertion sort as implemented in main.insertion_sort, counting comparisons and shifts
+    """
+    array = array.copy()
+    comparisons = shifts = 0
+    for i in range(1, len(array)):
+        key = array[i]
+        j = i - 1
+        while j >= 0:
+            comparisons += 1
+            if array[j] <= key:
+                break
+            array[j + 1] = array[j]
+            shifts += 1
+            j -= 1
+        array[j + 1] = key
+    return comparisons, shifts
+
+
+def sample_arrays():
+    rng = random.Random(0)
+    arrays = [[], [1], [1, 2], [2, 1], list(range(30)), list(range(30, 0, -1)), [7] * 12]
+    for _ in range(300):
+        size = rng.randint(0, 40)
+        arrays.append([rng.randint(-20, 20) for _ in range(size)])
+    return arrays
+
+
+def test_count_inversions_matches_brute_force():
+    for array in sample_arrays():
+        expected = sum(1 for i in range(len(array)) for j in range(i + 1, len(array))
+                       if array[i] > array[j])
+        assert main.count_inversions(array)[0] == expected
+
+
+@pytest.mark.parametrize("algorithm, counted_sort", [
+    ("bubble", counted_bubble_sort),
+    ("insertion", counted_insertion_sort),
+])
+def test_exact_predictions(algorithm, counted_sort):
+    for array in sample_arrays():
+        prediction = main.analyze_array(array)["predictions"][algorithm]
+        comparisons, moves = counted_sort(array)
+        assert prediction["comparisons"] == comparisons
+        assert prediction["moves"] == moves
+        if array:
+            assert prediction["frames"] == len(main.SORT_ALGORITHMS[algorithm](array))
+
+
+def test_analyze_readme_example():
+    response = client.post("/analyze", json={"array": [5, 3, 8, 4, 2]})
+    assert response.status_code == 200
+    result = response.json()
+
+    metrics = result["metrics"]
+    assert metrics["sortedness"] == pytest.approx(0.3)
+    del metrics["sortedness"]
+    assert metrics == {
+        "length": 5,
+        "inversions": 7,
+        "ascending_runs": 0,
+        "descending_runs": 2,
+        "longest_ascending_run": 0,
+        "longest_descending_run": 3,
+        "duplicate_ratio": 0.0,
+        "min_value": 2,
+        "max_value": 8,
+        "value_range": 6,
+        "max_displacement": 4,
+    }
+    bubble = result["predictions"]["bubble"]
+    assert (bubble["comparisons"], bubble["moves"], bubble["operations"]) == (10, 7, 17)
+    assert result["recommended"] == "selection"
+
+
+def guard_arrays():
+    rng = random.Random(1)
+    for n in [1, 2, 3, 10, 50, 120]:
+        yield list(range(n))
+        yield list(range(n, 0, -1))
+        yield [5] * n
+        # Zigzag input, quadratic for the last-element pivot without long runs
+        yield [value for k in range(n // 2) for value in (k, 100 - k)] or [0]
+        for _ in range(3):
+            yield [rng.randint(0, 1000) for _ in range(n)]
+
+
+@pytest.mark.parametrize("algorithm", list(main.SORT_ALGORITHMS))
+def test_estimate_is_an_upper_bound(algorithm):
+    for array in guard_arrays():
+        for output in ["full", "stats"]:
+            request = main.SortRequest(array=array, algorithm=algorithm, output=output)
+            estimate = main.estimate_sort(request)
+            body = main.encode_result(main.run_sort(request))
+            assert estimate["frames"] >= len(main.SORT_ALGORITHMS[algorithm](array))
+            assert estimate["response_bytes"] >= len(body)
+
+
+def test_quick_sort_frames_are_exact():
+    for array in guard_arrays():
+        assert main.count_quick_sort_frames(array, 10 ** 9) == len(main.quick_sort(array))
+
+
+def test_get_sort_matches_post():
+    post = client.post("/sort", json={"array": [5, 3, 8], "algorithm": "merge"})
+    get = client.get("/sort", params={"algorithm": "merge", "array": "5,3,8"})
+    assert get.status_code == 200
+    assert get.json() == post.json()
+    assert get.headers["etag"] == post.headers["etag"]
+
+    cached = client.get("/sort", params={"algorithm": "merge", "array": "5,3,8"},
+                        headers={"If-None-Match": get.headers["etag"]})
+    assert cached.status_code == 304
+
+
+@pytest.mark.parametrize("params, status", [
+    ({"algorithm": "radix"}, 422),
+    ({"algorithm": "bucket", "array": ""}, 400),
+    ({"algorithm": "bubble", "array": "1,,2"}, 400),
+    ({"algorithm": "bubble", "array": "1,2,"}, 400),
+    ({"algorithm": "bubble", "array": "1,a"}, 400),
+    ({"algorithm": "bubble", "array": "1_0,2"}, 400),
+    ({"algorithm": "bubble", "array": "+3,2"}, 400),
+    ({"algorithm": "bubble", "array": " 10,2"}, 400),
+    ({"algorithm": "bubble", "array": "010,2"}, 400),
+    ({"algorithm": "bubble", "array": "-0,2"}, 400),
+])
+def test_get_sort_rejects_invalid_arrays(params, status):
+    assert client.get("/sort", params=params).status_code == status
+
+
+def test_warm_up_does_not_evict_presets(tmp_path, monkeypatch):
+    store = main.ResultStore(str(tmp_path / "results.db"), 200 * 1024)
+    monkeypatch.setattr(main, "RESULT_STORE", store)
+
+    main.warm_result_store()
+    stored = [main.sort_request_hash(request) for request in main.preset_requests()
+              if main.sort_request_hash(request) in store]
+    assert stored
+
+    # A second warm-up finds the same presets and writes nothing
+    main.warm_result_store()
+    assert [main.sort_request_hash(request) for request in main.preset_requests()
+            if main.sort_request_hash(request) in store] == stored
+
+
+def test_result_store_evicts_least_recently_used(tmp_path):
+    store = main.ResultStore(str(tmp_path / "results.db"), 1000)
+    bodies = {key: random.Random(key).randbytes(400) for key in ["a", "b", "c"]}
+    store.put("a", bodies["a"])
+    store.put("b", bodies["b"])
+    assert store.get("a") == bodies["a"]
+    store.put("c", bodies["c"])
+    assert "a" in store and "b" not in store and "c" in store
+
+
+def test_analyze_rejects_long_arrays(monkeypatch):
+    monkeypatch.setattr(main, "MAX_ARRAY_LENGTH", 10)
+    assert client.post("/analyze", json={"array": list(range(10))}).status_code == 200
+    assert client.post("/analyze", json={"array": list(range(11))}).status_code == 413
+
+
+@pytest.mark.parametrize("body", [
+    {"array": [], "algorithm": "radix"},
+    {"array": [], "algorithm": "bucket"},
+    {"array": [], "algorithm": "bubble"},
+    {"array": [3, -1, 2], "algorithm": "radix"},
+])
+def test_sort_rejects_unsupported_input(body):
+    estimate = client.post("/sort/estimate", json=body).json()
+    assert not estimate["accepted"] and not estimate["supported"]
+    assert client.post("/sort", json=body).status_code == 400
+
+
+def test_estimate_rejects_on_length_before_analysis(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("predictions should not be computed")
+
+    monkeypatch.setattr(main, "predict_costs", fail)
+    monkeypatch.setattr(main, "count_quick_sort_frames", fail)
+    for algorithm in main.SORT_ALGORITHMS:
+        request = main.SortRequest(array=list(range(1, main.MAX_SORT_FRAMES + 2)), algorithm=algorithm)
+        estimate = main.estimate_sort(request)
+        assert not estimate["accepted"]
+        assert estimate["frames"] > main.MAX_SORT_FRAMES
+
+
+def test_estimate_and_sort_reject_long_arrays(monkeypatch):
+    monkeypatch.setattr(main, "MAX_ARRAY_LENGTH", 10)
+    body = {"array": list(range(11)), "algorithm": "merge"}
+    assert client.post("/sort/estimate", json=body).status_code == 413
+    assert client.post("/sort", json=body).status_code == 413
+
+
+def test_post_sort_precondition_and_caching_headers(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("the guard should not run for a matching ETag")
+
+    body = {"array": [4, 1, 3], "algorithm": "heap"}
+    first = client.post("/sort", json=body)
+    assert "cache-control" not in first.headers
+
+    monkeypatch.setattr(main, "estimate_sort", fail)
+    conditional = client.post("/sort", json=body, headers={"If-None-Match": first.headers["etag"]})
+    assert conditional.status_code == 412
+
+    get = client.get("/sort", params={"algorithm": "heap", "array": "4,1,3"},
+                     headers={"If-None-Match": first.headers["etag"]})
+    assert get.status_code == 304
+    assert get.headers["cache-control"].startswith("public")
+
+
+def test_percentile_nearest_rank():
+    assert loadtest.percentile([], 0.5) is None
+    assert loadtest.percentile([7], 0.99) == 7
+    values = list(range(1, 11))
+    assert loadtest.percentile(values, 0.5) == 5
+    assert loadtest.percentile(values, 0.99) == 10
+    values = list(range(1, 101))
+    assert (loadtest.percentile(values, 0.95), loadtest.percentile(values, 0.99)) == (95, 99)
+
+
+def test_build_workload_is_deterministic():
+    def build(seed):
+        return loadtest.build_workload(["bubble", "merge"], [5, 10], ["POST /sort", "GET /sort"], 100, 3, seed)
+
+    assert build(1) == build(1)
+    assert build(1) != build(2)
+    assert len(build(1)) == 8
+    assert all(len(item["pool"]) == 3 for item in build(1))
+
+
+def test_run_level_smoke():
+    port = loadtest.free_port()
+    process = loadtest.start_server(port)
+    try:
+        workload = loadtest.build_workload(["merge"], [5], ["POST /sort", "GET /sort"], 100, 2, 0)
+        report = loadtest.run_level("127.0.0.1", port, workload, concurrency=2, duration=0,
+                                    requests_per_level=6, inputs="cold", max_value=100,
+                                    pid=process.pid, rss_interval=0.05, seed=0)
+    finally:
+        process.terminate()
+        process.wait()
+
+    assert {"concurrency", "duration_s", "throughput_rps", "bytes_received", "status_codes", "requests",
+            "errors", "error_rate", "latency_ms", "by_request", "rss"} <= set(report)
+    assert report["requests"] == 6
+    assert report["errors"] == 0
+    assert set(report["latency_ms"]) == {"p50", "p95", "p99", "mean", "max"}
+
+
+def test_result_store_tracks_total_size(tmp_path):
+    path = str(tmp_path / "results.db")
+    store = main.ResultStore(path, 10_000)
+    store.put("a", b"x" * 500)
+    store.put("b", b"y" * 500)
+    store.put("a", random.Random(0).randbytes(300))
+    actual = store.connection.execute("SELECT SUM(size) FROM results").fetchone()[0]
+    assert store.total_bytes == actual
+    assert main.ResultStore(path, 10_000).total_bytes == actual
+
+
+def test_store_hits_skip_the_guard(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "RESULT_STORE", main.ResultStore(str(tmp_path / "results.db"), 10 ** 6))
+    body = {"array": [9, 2, 7], "algorithm": "quick"}
+    first = client.post("/sort", json=body)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the guard should not run for a stored result")
+
+    monkeypatch.setattr(main, "estimate_sort", fail)
+    second = client.post("/sort", json=body)
+    assert second.status_code == 200
+    assert second.content == first.content
@@ -23,20 +23,19 @@ export const sortArray = async (
   algorithm: SortingAlgorithm
 ): Promise<SortingResponse> => {
   try {
-    const response = await fetch(`${API_URL}/sort`, {
-      method: "POST",
-      headers: {
-        "Content-Type": "application/json",
-      },
-      body: JSON.stringify({
-        array,
-        algorithm,
-      }),
+    // Use the GET variant so the browser can cache and revalidate the result
+    const params = new URLSearchParams({
+      algorithm,
+      array: array.join(","),
     });
+    const response = await fetch(`${API_URL}/sort?${params}`);
 
     if (!response.ok) {
       const errorData = await response.json();
-      throw new Error(errorData.detail || "Failed to get sorting results");
+      // Oversized requests are rejected with a structured detail
+      const message =
+        typeof errorData.detail === "string" ? errorData.detail : errorData.detail?.message;
+      throw new Error(message || "Failed to get sorting results");
     }
 
     return await response.json();